@@ -9,14 +9,15 @@ are not "#N/A" or empty). The parsed data is structured for later documentation
 """
 
 import csv
+import io
 import sys
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Union, BinaryIO
 import argparse
 from rules_manager import RulesManager
 
 
 class ProviderPaymentParser:
-    def __init__(self, csv_file_path: str, verbose: bool = True, rules_file_path: str = 'feature_rules.json', rules_file_paths: Optional[List[str]] = None):
+    def __init__(self, csv_file_path: Union[str, BinaryIO], verbose: bool = True, rules_file_path: str = 'feature_rules.json', rules_file_paths: Optional[List[str]] = None):
         self.csv_file_path = csv_file_path
         self.verbose = verbose
         self.data = []
@@ -30,11 +31,16 @@ class ProviderPaymentParser:
         self.rules_manager.load_rules()
         
     def load_csv(self) -> None:
-        """Load CSV data from file."""
+        """Load CSV data from a file path or an open binary file object."""
         try:
-            with open(self.csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                self.data = list(reader)
+            if hasattr(self.csv_file_path, 'read'):
+                # Decode in memory: SpooledTemporaryFile only supports TextIOWrapper from Python 3.11
+                content = self.csv_file_path.read().decode('utf-8')
+                self.data = list(csv.reader(io.StringIO(content, newline='')))
+            else:
+                with open(self.csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
+                    reader = csv.reader(csvfile)
+                    self.data = list(reader)
             if self.verbose:
                 print(f"✓ Successfully loaded CSV with {len(self.data)} rows")
         except FileNotFoundError:
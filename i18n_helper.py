@@ -4,11 +4,30 @@ Simple i18n helper for test case descriptions
 Demonstrates how to load and use translation files with the feature rules
 """
 
+import functools
 import json
 import os
 from typing import Dict, Any, Optional, List
 from rules_manager import RulesManager
 
+
+@functools.lru_cache(maxsize=32)
+def _read_json_file(file_path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a JSON file; mtime_ns and size are only part of the cache key"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _load_json_file(file_path: str) -> Any:
+    """
+    Load a JSON file, reusing the parsed data while the file is unchanged.
+    
+    The returned object is shared between callers and must not be mutated.
+    """
+    stat = os.stat(file_path)
+    return _read_json_file(file_path, stat.st_mtime_ns, stat.st_size)
+
+
 class I18nHelper:
     def __init__(self, default_locale: str = 'en', rules_file_paths: Optional[List[str]] = None):
         self.default_locale = default_locale
@@ -30,8 +49,7 @@ class I18nHelper:
         for locale in ['en', 'es', 'pt']:
             file_path = os.path.join(i18n_dir, f'{locale}.json')
             if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.translations[locale] = json.load(f)
+                self.translations[locale] = _load_json_file(file_path)
     
     def _load_feature_rules(self):
         """Load feature rules from JSON file(s)"""
@@ -55,78 +73,77 @@ class I18nHelper:
         
         for file_path in files_to_load:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                    # Merge feature rules
-                    for feature_name, rule_data in data.get('rules', {}).items():
-                        if feature_name not in self.feature_rules:
-                            # Deep copy the rule data
-                            import copy
-                            self.feature_rules[feature_name] = copy.deepcopy(rule_data)
-                        else:
-                            # Merge existing rule
-                            existing = self.feature_rules[feature_name]
+                data = _load_json_file(file_path)
+                
+                # Merge feature rules
+                for feature_name, rule_data in data.get('rules', {}).items():
+                    if feature_name not in self.feature_rules:
+                        # Deep copy the rule data
+                        import copy
+                        self.feature_rules[feature_name] = copy.deepcopy(rule_data)
+                    else:
+                        # Merge existing rule
+                        existing = self.feature_rules[feature_name]
+                        
+                        # Merge by_payment_method
+                        if 'by_payment_method' in rule_data:
+                            if 'by_payment_method' not in existing:
+                                existing['by_payment_method'] = {}
                             
-                            # Merge by_payment_method
-                            if 'by_payment_method' in rule_data:
-                                if 'by_payment_method' not in existing:
-                                    existing['by_payment_method'] = {}
-                                
-                                for pm_name, pm_data in rule_data['by_payment_method'].items():
-                                    if pm_name not in existing['by_payment_method']:
-                                        existing['by_payment_method'][pm_name] = copy.deepcopy(pm_data)
-                                    else:
-                                        # Merge integration_steps
-                                        existing_pm = existing['by_payment_method'][pm_name]
-                                        if 'integration_steps' in pm_data:
-                                            existing_steps = existing_pm.get('integration_steps', [])
-                                            new_steps = pm_data.get('integration_steps', [])
-                                            # Append new steps that don't already exist
-                                            for new_step in new_steps:
-                                                step_key = (new_step.get('documentation_url', ''), new_step.get('comment', ''))
-                                                if not any((s.get('documentation_url', '') == step_key[0] and 
-                                                           s.get('comment', '') == step_key[1]) for s in existing_steps):
-                                                    existing_steps.append(new_step)
-                                            existing_pm['integration_steps'] = existing_steps
-                                        
-                                        # Merge testcases
-                                        if 'testcases' in pm_data:
-                                            existing_tcs = {tc['id']: tc for tc in existing_pm.get('testcases', [])}
-                                            for tc in pm_data.get('testcases', []):
-                                                if tc['id'] not in existing_tcs:
-                                                    existing_pm.setdefault('testcases', []).append(tc)
+                            for pm_name, pm_data in rule_data['by_payment_method'].items():
+                                if pm_name not in existing['by_payment_method']:
+                                    existing['by_payment_method'][pm_name] = copy.deepcopy(pm_data)
+                                else:
+                                    # Merge integration_steps
+                                    existing_pm = existing['by_payment_method'][pm_name]
+                                    if 'integration_steps' in pm_data:
+                                        existing_steps = existing_pm.get('integration_steps', [])
+                                        new_steps = pm_data.get('integration_steps', [])
+                                        # Append new steps that don't already exist
+                                        for new_step in new_steps:
+                                            step_key = (new_step.get('documentation_url', ''), new_step.get('comment', ''))
+                                            if not any((s.get('documentation_url', '') == step_key[0] and 
+                                                       s.get('comment', '') == step_key[1]) for s in existing_steps):
+                                                existing_steps.append(new_step)
+                                        existing_pm['integration_steps'] = existing_steps
+                                    
+                                    # Merge testcases
+                                    if 'testcases' in pm_data:
+                                        existing_tcs = {tc['id']: tc for tc in existing_pm.get('testcases', [])}
+                                        for tc in pm_data.get('testcases', []):
+                                            if tc['id'] not in existing_tcs:
+                                                existing_pm.setdefault('testcases', []).append(tc)
+                        
+                        # Merge by_provider (provider-specific steps)
+                        if 'by_provider' in rule_data:
+                            if 'by_provider' not in existing:
+                                existing['by_provider'] = {}
                             
-                            # Merge by_provider (provider-specific steps)
-                            if 'by_provider' in rule_data:
-                                if 'by_provider' not in existing:
-                                    existing['by_provider'] = {}
-                                
-                                for provider, provider_steps in rule_data['by_provider'].items():
-                                    if provider not in existing['by_provider']:
-                                        existing['by_provider'][provider] = copy.deepcopy(provider_steps)
-                                    else:
-                                        # Append new steps
-                                        existing['by_provider'][provider].extend(provider_steps)
+                            for provider, provider_steps in rule_data['by_provider'].items():
+                                if provider not in existing['by_provider']:
+                                    existing['by_provider'][provider] = copy.deepcopy(provider_steps)
+                                else:
+                                    # Append new steps
+                                    existing['by_provider'][provider].extend(provider_steps)
+                
+                # Merge master rules
+                master = data.get('master', {})
+                if master:
+                    # Merge master testcases
+                    if 'testcases' in master:
+                        existing_tcs = {tc['id']: tc for tc in self.master_rules.get('testcases', [])}
+                        for tc in master.get('testcases', []):
+                            if tc['id'] not in existing_tcs:
+                                self.master_rules.setdefault('testcases', []).append(tc)
                     
-                    # Merge master rules
-                    master = data.get('master', {})
-                    if master:
-                        # Merge master testcases
-                        if 'testcases' in master:
-                            existing_tcs = {tc['id']: tc for tc in self.master_rules.get('testcases', [])}
-                            for tc in master.get('testcases', []):
-                                if tc['id'] not in existing_tcs:
-                                    self.master_rules.setdefault('testcases', []).append(tc)
-                        
-                        # Merge master integration_steps
-                        if 'integration_steps' in master:
-                            existing_steps = {(s.get('documentation_url', ''), s.get('comment', '')): s 
-                                             for s in self.master_rules.get('integration_steps', [])}
-                            for step in master.get('integration_steps', []):
-                                step_key = (step.get('documentation_url', ''), step.get('comment', ''))
-                                if step_key not in existing_steps:
-                                    self.master_rules.setdefault('integration_steps', []).append(step)
+                    # Merge master integration_steps
+                    if 'integration_steps' in master:
+                        existing_steps = {(s.get('documentation_url', ''), s.get('comment', '')): s 
+                                         for s in self.master_rules.get('integration_steps', [])}
+                        for step in master.get('integration_steps', []):
+                            step_key = (step.get('documentation_url', ''), step.get('comment', ''))
+                            if step_key not in existing_steps:
+                                self.master_rules.setdefault('integration_steps', []).append(step)
             except Exception as e:
                 # Skip files that can't be loaded
                 pass
@@ -341,7 +341,7 @@ class RulesManager:
         enriched_data = {
             'name': feature_name,
             'value': feature_value,
-            'has_value': bool(feature_value.strip()) if feature_value else False,
+            'has_value': bool(feature_value) and not feature_value.isspace(),
             'feature_name': feature_name,
             'feature_value': feature_value,
             'has_rule': rule is not None
@@ -26,8 +26,8 @@ coverage erase 2>/dev/null || true
 echo "🚀 Running test suite..."
 echo ""
 
-# Run all tests
-pytest
+# Run all tests, including the slow end-to-end rendering tests
+pytest --run-slow
 
 # Check exit code
 test_exit_code=$?
@@ -52,6 +52,7 @@ echo "  pytest tests/test_integration.py   # Run only integration tests"
 echo "  pytest -k test_upload              # Run tests matching pattern"
 echo "  pytest -m unit                     # Run only unit tests"
 echo "  pytest -m integration              # Run only integration tests"
+echo "  pytest --run-slow                  # Include slow rendering tests"
 echo "  pytest --cov-report=html           # Generate HTML coverage report"
 
 exit $test_exit_code 
\ No newline at end of file
@@ -5,6 +5,7 @@ Shared pytest fixtures and configuration
 
 import pytest
 import os
+import re
 import sys
 import tempfile
 from io import BytesIO
@@ -98,10 +99,27 @@ def uploaded_file_data():
 # Test markers for organizing tests
 pytest_plugins = []
 
+def pytest_addoption(parser):
+    """Register custom command line options."""
+    parser.addoption(
+        "--run-slow", action="store_true", default=False,
+        help="run tests marked as slow (end-to-end rendering, large uploads)"
+    )
+
+
 # Configure test collection
 def pytest_collection_modifyitems(config, items):
     """Automatically mark tests based on their location and name."""
+    # Slow tests are skipped unless requested via --run-slow or a -m expression
+    # that selects them; "-m 'not slow'" or "-m unit" keeps skipping them
+    markexpr = config.getoption("markexpr") or ""
+    run_slow = config.getoption("--run-slow") or re.search(r"(?<!not )\bslow\b", markexpr)
+    skip_slow = pytest.mark.skip(reason="slow test: use --run-slow to run")
+
     for item in items:
+        if not run_slow and "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
         # Mark integration tests
         if "integration" in item.nodeid:
             item.add_marker(pytest.mark.integration)
@@ -133,4 +151,10 @@ def pytest_configure(config):
     )
     config.addinivalue_line(
         "markers", "api: marks tests as API tests"
+    )
+    config.addinivalue_line(
+        "markers", "slow: marks tests as slow end-to-end rendering or large upload tests"
+    )
+    config.addinivalue_line(
+        "markers", "fs: marks tests that write rules or i18n files on disk"
     ) 
\ No newline at end of file
@@ -79,6 +79,16 @@ class TestProviderPaymentParser:
         assert len(parser.data) > 0
         assert len(parser.data) == 10  # Based on our test fixture
 
+    def test_load_csv_from_file_object(self, valid_csv_path):
+        """Test CSV loading from an open binary file object"""
+        with open(valid_csv_path, 'rb') as csv_file:
+            parser = ProviderPaymentParser(csv_file, verbose=False)
+            parser.load_csv()
+            
+            assert not csv_file.closed
+        
+        assert len(parser.data) == 10
+
     def test_load_csv_file_not_found(self):
         """Test CSV loading with non-existent file"""
         parser = ProviderPaymentParser('nonexistent.csv', verbose=False)
@@ -276,6 +276,16 @@ class TestRulesManager:
         assert enriched['has_value'] is False
         assert enriched['has_rule'] is True
 
+    def test_enrich_feature_data_whitespace_value(self, temp_rules_file):
+        """Test enriching feature data with a whitespace-only value"""
+        manager = RulesManager(temp_rules_file, verbose=False)
+        manager.load_rules()
+        
+        enriched = manager.enrich_feature_data('Country', ' \t ')
+        
+        assert enriched['has_value'] is False
+        assert enriched['value'] == ' \t '
+
     def test_reload_rules(self, temp_rules_file, capsys):
         """Test reloading rules"""
         manager = RulesManager(temp_rules_file, verbose=True)
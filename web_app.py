@@ -5,7 +5,9 @@ Handles BDM handover documents for implementation analysis
 """
 
 from flask import Flask, render_template, request, flash, redirect, url_for, jsonify, session, make_response
+import functools
 import os
+import sys
 import tempfile
 from io import BytesIO
 from werkzeug.utils import secure_filename
@@ -14,6 +16,11 @@ from test_case_generator import TestCaseGenerator
 from rules_manager import RulesManager
 import json
 
+try:
+    import orjson
+except ImportError:  # optional speedup; the standard library json is used instead
+    orjson = None
+
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this'  # Change this in production
 app.config['TEMPLATES_AUTO_RELOAD'] = True
@@ -21,8 +28,9 @@ app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'csv'}
+ALLOWED_EXTENSIONS = frozenset({'csv'})
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB max file size
+SAMPLE_MAX_AGE = 24 * 60 * 60  # Cache the sample CSV download for a day
 
 # Ensure upload folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -31,17 +39,199 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension."""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in ALLOWED_EXTENSIONS
 
-@app.route('/')
-def index():
-    """Main page with upload form."""
-    # Get available rules files
-    available_rules_files = RulesManager.get_provider_rules_files()
-    # Extract provider names from filenames
+# Users re-upload the same scoping documents, so sanitized names repeat
+cached_secure_filename = functools.lru_cache(maxsize=512)(secure_filename)
+
+def _parse_rules_file(rules_path):
+    """Parse a rules JSON file, using orjson when it is installed."""
+    with open(rules_path, 'rb') as f:
+        content = f.read()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+# Test case fields whose values repeat across every rule
+_INTERNED_VALUE_KEYS = ('type', 'environment')
+
+def _intern_rules(obj):
+    """Intern dict keys and enum-like values so cached rules share one string per name."""
+    if isinstance(obj, dict):
+        return {
+            sys.intern(k): (sys.intern(v) if k in _INTERNED_VALUE_KEYS and isinstance(v, str)
+                            else _intern_rules(v))
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_intern_rules(item) for item in obj]
+    return obj
+
+@functools.lru_cache(maxsize=16)
+def _read_rules_file(rules_path, mtime_ns, size):
+    """Parse a rules JSON file; mtime_ns and size are only part of the cache key"""
+    return _intern_rules(_parse_rules_file(rules_path))
+
+@functools.lru_cache(maxsize=16)
+def _read_testcase_index(rules_path, mtime_ns, size):
+    """Map test case IDs to the cached test case dicts the API looks them up in"""
+    rules_data = _read_rules_file(rules_path, mtime_ns, size)
+    index = {}
+    # Same precedence as a linear search: payment method test cases, then master
+    for rule in rules_data.get('rules', {}).values():
+        for pm_config in rule.get('by_payment_method', {}).values():
+            for testcase in pm_config.get('testcases', []):
+                index.setdefault(testcase['id'], testcase)
+    for testcase in rules_data.get('master', {}).get('testcases', []):
+        index.setdefault(testcase['id'], testcase)
+    return index
+
+def load_testcase_index(rules_file='feature_rules.json'):
+    """Return the read-only test case index for a rules file, rebuilt when it changes."""
+    stat = os.stat(rules_file)
+    return _read_testcase_index(os.path.abspath(rules_file), stat.st_mtime_ns, stat.st_size)
+
+def load_rules_data(rules_file='feature_rules.json', for_update=False):
+    """
+    Load a rules file, reusing the parsed data while it is unchanged.
+    
+    The returned dict is shared between requests and must not be mutated.
+    Routes that edit the rules pass for_update=True to get a fresh parse of
+    their own, and write it back with save_rules_data().
+    """
+    if for_update:
+        return _parse_rules_file(rules_file)
+    stat = os.stat(rules_file)
+    return _read_rules_file(os.path.abspath(rules_file), stat.st_mtime_ns, stat.st_size)
+
+def rules_etag(*rules_files):
+    """Build a weak ETag value from the inode, modification time and size of rules files."""
+    parts = []
+    for rules_file in rules_files:
+        # save_rules_data() replaces the file, so the inode changes on every save
+        stat = os.stat(rules_file)
+        parts.append(f'{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    return '.'.join(parts)
+
+# Rendered feature rules pages keyed by URL and rules ETag; cleared on every save
+_page_cache = {}
+_PAGE_CACHE_SIZE = 64
+
+def cached_page(etag):
+    """Return the cached page for this URL and rules ETag, or None if it must be rendered."""
+    # A pending flash message must be rendered into the page, so skip the cache then
+    if session.get('_flashes'):
+        return None
+    page = _page_cache.get((request.url, etag))
+    if page is None:
+        return None
+    response = make_response(page)
+    response.set_etag(etag, weak=True)
+    return response
+
+def store_page(etag, page, has_flash):
+    """
+    Cache a rendered page for this URL and rules ETag and return it as a response.
+    
+    Rendering pops pending flashes, so callers check for them beforehand; a page
+    rendered with a flash message belongs to one response, so it is neither
+    cached nor given an ETag.
+    """
+    response = make_response(page)
+    if has_flash:
+        # Without an ETag the browser can't revalidate this page into a 304 later
+        return response
+    if len(_page_cache) >= _PAGE_CACHE_SIZE:
+        _page_cache.clear()
+    _page_cache[(request.url, etag)] = page
+    response.set_etag(etag, weak=True)
+    return response
+
+def not_modified(etag):
+    """Return a 304 response if the client already has this page, otherwise None."""
+    # A pending flash message must still be rendered, so always send the page then
+    if session.get('_flashes') or not request.if_none_match.contains_weak(etag):
+        return None
+    response = make_response('', 304)
+    response.set_etag(etag, weak=True)
+    return response
+
+def save_rules_data(rules_data, rules_file='feature_rules.json'):
+    """
+    Write a rules file and drop cached parses, which may share its mtime and size.
+    
+    The data is written to a uniquely named temporary file next to the target
+    and moved into place, so concurrent readers never see a partially written
+    file and concurrent writers never share a temporary file.
+    """
+    # Serialize first, so a failing dump never creates a temporary file
+    if orjson is not None:
+        content = orjson.dumps(rules_data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(rules_data, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(rules_file) or '.', suffix='.tmp')
+    try:
+        f = os.fdopen(fd, 'wb')
+    except BaseException:
+        # The descriptor was never handed to a file object, so close it here
+        os.close(fd)
+        os.unlink(temp_file)
+        raise
+    try:
+        with f:
+            f.write(content)
+        # mkstemp creates the file private to the owner; keep the target's permissions
+        try:
+            os.chmod(temp_file, os.stat(rules_file).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temp_file, 0o644)
+        os.replace(temp_file, rules_file)
+    except BaseException:
+        os.unlink(temp_file)
+        raise
+    _read_rules_file.cache_clear()
+    _read_testcase_index.cache_clear()
+    _page_cache.clear()
+
+def _file_stamp(path):
+    """Identify the on-disk version of a file, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=16)
+def _build_test_case_generator(locale, rules_file_paths, input_stamps):
+    """Create a TestCaseGenerator; input_stamps is only part of the cache key"""
+    return TestCaseGenerator(locale=locale, rules_file_paths=list(rules_file_paths) or None)
+
+def get_test_case_generator(locale, rules_file_paths=None):
+    """
+    Return a TestCaseGenerator shared between requests, rebuilt when a file it loads changes.
+    
+    Generators only read their loaded rules and translations, so one instance can serve
+    every request for the same locale and rules files.
+    """
+    rules_file_paths = tuple(rules_file_paths or ())
+    if not all(isinstance(path, str) for path in rules_file_paths):
+        # Malformed paths from API clients cannot key the cache; build a generator as before
+        return TestCaseGenerator(locale=locale, rules_file_paths=list(rules_file_paths))
+    
+    # The generator always loads the default rules and every translation file
+    input_files = [os.path.join(app.root_path, 'feature_rules.json')]
+    input_files += [os.path.join(app.root_path, 'i18n', f'{code}.json') for code in ('en', 'es', 'pt')]
+    input_files += rules_file_paths
+    input_stamps = tuple(_file_stamp(path) for path in input_files)
+    return _build_test_case_generator(locale, rules_file_paths, input_stamps)
+
+@functools.lru_cache(maxsize=4)
+def _read_provider_rules_files(directory, real_directory, mtime_ns):
+    """List provider rules files; real_directory and mtime_ns are only part of the cache key"""
     rules_files_info = []
-    for file_path in available_rules_files:
+    for file_path in RulesManager.get_provider_rules_files(directory):
         filename = os.path.basename(file_path)
         # Extract provider name from feature_rules_{provider}.json
         if filename.startswith('feature_rules_') and filename.endswith('.json'):
@@ -51,32 +241,45 @@ def index():
                 'filename': filename,
                 'provider': provider
             })
+    return tuple(rules_files_info)
+
+def list_provider_rules_files(directory='.'):
+    """
+    List provider rules files, rescanning only when the directory changes.
     
-    return render_template('index.html', available_rules_files=rules_files_info)
+    The returned dicts are shared between requests and must not be mutated.
+    """
+    stat = os.stat(directory)
+    return _read_provider_rules_files(directory, os.path.realpath(directory), stat.st_mtime_ns)
+
+@app.route('/')
+def index():
+    """Main page with upload form."""
+    return render_template('index.html', available_rules_files=list_provider_rules_files())
 
 @app.route('/api/rules-files', methods=['GET'])
 def api_list_rules_files():
     """List available rules files."""
     try:
-        available_rules_files = RulesManager.get_provider_rules_files()
-        rules_files_info = []
-        for file_path in available_rules_files:
-            filename = os.path.basename(file_path)
-            if filename.startswith('feature_rules_') and filename.endswith('.json'):
-                provider = filename[14:-5]
-                rules_files_info.append({
-                    'path': file_path,
-                    'filename': filename,
-                    'provider': provider
-                })
-        
         return jsonify({
             'success': True,
-            'rules_files': rules_files_info
+            'rules_files': list_provider_rules_files()
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def spool_upload(file):
+    """Copy an uploaded file into a spooled temporary file, kept in memory up to MAX_FILE_SIZE."""
+    upload = tempfile.SpooledTemporaryFile(max_size=MAX_FILE_SIZE)
+    file.save(upload)
+    upload.seek(0)
+    return upload
+
+def parse_upload(upload, rules_file_paths=None):
+    """Parse a spooled CSV upload (non-verbose mode for web and API) and return the parser and results."""
+    parser = ProviderPaymentParser(upload, verbose=False, rules_file_paths=rules_file_paths or None)
+    return parser, parser.parse()
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Handle file upload and processing."""
@@ -92,11 +295,12 @@ def upload_file():
     
     if file and allowed_file(file.filename):
         try:
-            # Create a temporary file to save the upload
-            with tempfile.NamedTemporaryFile(mode='w+b', suffix='.csv', delete=False) as temp_file:
-                file.save(temp_file.name)
-                temp_filename = temp_file.name
-            
+            upload = spool_upload(file)
+        except Exception as e:
+            flash(f'Error uploading file: {str(e)}')
+            return redirect(url_for('index'))
+        
+        with upload:
             # Get selected rules files from form
             selected_rules_files = request.form.getlist('rules_files[]')
             # Validate that selected files exist
@@ -110,18 +314,9 @@ def upload_file():
             # Store selected rules files in session
             session['selected_rules_files'] = valid_rules_files
             
-            # Process the CSV file (non-verbose mode for web)
-            if valid_rules_files:
-                parser = ProviderPaymentParser(temp_filename, verbose=False, rules_file_paths=valid_rules_files)
-            else:
-                parser = ProviderPaymentParser(temp_filename, verbose=False)
-            
             # Custom parsing to capture any errors
             try:
-                results = parser.parse()
-                
-                # Clean up temporary file
-                os.unlink(temp_filename)
+                parser, results = parse_upload(upload, valid_rules_files)
                 
                 if not results:
                     flash('No valid provider + payment method combinations found in the CSV file.')
@@ -129,38 +324,25 @@ def upload_file():
                 
                 # Store the raw results in session for test case generation
                 session['parsed_results'] = results
-                session['filename'] = secure_filename(file.filename)
+                session['filename'] = cached_secure_filename(file.filename)
                 
                 # Process results for web display with enriched data
-                processed_results = []
-                enriched_data = parser.export_enriched_dict()
-                
-                for key, data in enriched_data.items():
-                    provider_data = {
+                processed_results = [
+                    {
                         'provider': data['provider'],
                         'payment_method': data['payment_method'],
-                        'features': []
+                        'features': list(data['features'].values())
                     }
-                    
-                    for feature_name, feature_data in data['features'].items():
-                        provider_data['features'].append(feature_data)
-                    
-                    processed_results.append(provider_data)
+                    for data in parser.export_enriched_dict().values()
+                ]
                 
                 return render_template('results.html', 
                                      results=processed_results,
-                                     filename=secure_filename(file.filename))
+                                     filename=cached_secure_filename(file.filename))
                 
             except Exception as e:
-                # Clean up temporary file on error
-                if os.path.exists(temp_filename):
-                    os.unlink(temp_filename)
                 flash(f'Error processing CSV file: {str(e)}')
                 return redirect(url_for('index'))
-                
-        except Exception as e:
-            flash(f'Error uploading file: {str(e)}')
-            return redirect(url_for('index'))
     else:
         flash('Invalid file type. Please upload a CSV file.')
         return redirect(url_for('index'))
@@ -193,7 +375,7 @@ def generate_test_cases():
         # Get selected rules files from session
         selected_rules_files = session.get('selected_rules_files', [])
         # Generate test cases using the stored results
-        generator = TestCaseGenerator(locale=language, rules_file_paths=selected_rules_files if selected_rules_files else None)
+        generator = get_test_case_generator(language, selected_rules_files)
         
         if output_format == 'html':
             # Generate HTML document
@@ -267,7 +449,7 @@ def api_generate_test_cases():
         # Get selected rules files from request if provided
         selected_rules_files = data.get('rules_files', [])
         # Generate test cases
-        generator = TestCaseGenerator(locale=language, rules_file_paths=selected_rules_files if selected_rules_files else None)
+        generator = get_test_case_generator(language, selected_rules_files)
         
         # Generate document in requested format
         if output_format == 'html':
@@ -346,7 +528,7 @@ def test_case_preview():
         # Get selected rules files from session
         selected_rules_files = session.get('selected_rules_files', [])
         # Generate test cases
-        generator = TestCaseGenerator(locale=language, rules_file_paths=selected_rules_files if selected_rules_files else None)
+        generator = get_test_case_generator(language, selected_rules_files)
         
         # Get test case data for preview
         test_cases_data = generator.generate_test_cases_for_features(session['parsed_results'], environment)
@@ -379,32 +561,20 @@ def api_upload():
         return jsonify({'error': 'Invalid file type. Only CSV files are allowed.'}), 400
     
     try:
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(mode='w+b', suffix='.csv', delete=False) as temp_file:
-            file.save(temp_file.name)
-            temp_filename = temp_file.name
-        
-        # Process the CSV file (non-verbose mode for API)
-        parser = ProviderPaymentParser(temp_filename, verbose=False)
-        results = parser.parse()
-        
-        # Clean up temporary file
-        os.unlink(temp_filename)
+        with spool_upload(file) as upload:
+            parser, results = parse_upload(upload)
         
         # Return enriched results for API
         enriched_results = parser.export_enriched_dict()
         
         return jsonify({
             'success': True,
-            'filename': secure_filename(file.filename),
+            'filename': cached_secure_filename(file.filename),
             'results': results,
             'enriched_results': enriched_results
         })
         
     except Exception as e:
-        # Clean up temporary file on error
-        if 'temp_filename' in locals() and os.path.exists(temp_filename):
-            os.unlink(temp_filename)
         return jsonify({'error': f'Error processing file: {str(e)}'}), 500
 
 @app.route('/example')
@@ -415,11 +585,14 @@ def example():
 @app.route('/download-sample')
 def download_sample():
     """Download sample CSV file."""
-    from flask import send_file
-    return send_file('sample_integrations.csv', 
-                     as_attachment=True,
-                     download_name='sample_integrations.csv',
-                     mimetype='text/csv')
+    from flask import send_from_directory
+    # Conditional responses let browsers revalidate the cached sample with a 304
+    return send_from_directory(app.root_path, 'sample_integrations.csv',
+                               as_attachment=True,
+                               download_name='sample_integrations.csv',
+                               mimetype='text/csv',
+                               conditional=True,
+                               max_age=SAMPLE_MAX_AGE)
 
 @app.route('/feature-rules')
 def feature_rules():
@@ -440,13 +613,18 @@ def feature_rules():
         # Store in session for API calls
         session['current_rules_file'] = rules_file
         
+        # The page shows the selected file, the default rules and the provider file list
+        provider_files = list_provider_rules_files()
+        etag = rules_etag(rules_file, 'feature_rules.json', *(info['path'] for info in provider_files))
+        cached = not_modified(etag) or cached_page(etag)
+        if cached is not None:
+            return cached
+        
         rules_manager = RulesManager(verbose=False)
         rules_manager.load_rules()
         
         # Get rules data for display
-        rules_data = {}
-        with open(rules_file, 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(rules_file)
         
         # Extract master rules separately
         master_rules = rules_data.get('master', None)
@@ -462,23 +640,21 @@ def feature_rules():
             })
         
         # Get provider-specific files
-        provider_files = RulesManager.get_provider_rules_files()
-        for file_path in provider_files:
-            filename = os.path.basename(file_path)
-            if filename.startswith('feature_rules_') and filename.endswith('.json'):
-                provider = filename[14:-5]  # Remove 'feature_rules_' prefix and '.json' suffix
-                available_rules_files.append({
-                    'filename': filename,
-                    'name': provider,
-                    'path': file_path
-                })
+        for info in provider_files:
+            available_rules_files.append({
+                'filename': info['filename'],
+                'name': info['provider'],
+                'path': info['path']
+            })
         
-        return render_template('feature_rules.html', 
-                             rules_data=rules_data,
-                             master_rules=master_rules,
-                             current_rules_file=rules_file,
-                             available_rules_files=available_rules_files,
-                             summary=rules_manager.get_rules_summary())
+        has_flash = bool(session.get('_flashes'))
+        page = render_template('feature_rules.html', 
+                               rules_data=rules_data,
+                               master_rules=master_rules,
+                               current_rules_file=rules_file,
+                               available_rules_files=available_rules_files,
+                               summary=rules_manager.get_rules_summary())
+        return store_page(etag, page, has_flash)
     except Exception as e:
         flash(f'Error loading feature rules: {str(e)}')
         return redirect(url_for('index'))
@@ -487,8 +663,7 @@ def feature_rules():
 def edit_feature_rule(feature_name):
     """Edit a specific feature rule."""
     try:
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data()
         
         # Check if it's a master rule
         is_master_rule = feature_name == 'master'
@@ -523,8 +698,7 @@ def save_feature_rule():
             return redirect(url_for('feature_rules'))
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         # Check if it's a master rule
         is_master_rule = feature_name == 'master'
@@ -581,8 +755,7 @@ def save_feature_rule():
         rules_data['last_updated'] = datetime.now().strftime('%Y-%m-%d')
         
         # Save back to file
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         rule_type = "master rules" if is_master_rule else f'feature rule for "{feature_name}"'
         flash(f'Successfully updated {rule_type} with {len(integration_steps)} integration step(s).')
@@ -606,8 +779,7 @@ def add_feature_rule():
             return render_template('add_feature_rule.html')
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         # Check if feature already exists
         if feature_name in rules_data.get('rules', {}):
@@ -663,8 +835,7 @@ def add_feature_rule():
         rules_data['metadata']['total_rules'] = len(rules_data['rules'])
         
         # Save to file
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         flash(f'Successfully added feature rule "{feature_name}" with {len(integration_steps)} integration step(s).')
         return redirect(url_for('feature_rules'))
@@ -678,8 +849,7 @@ def delete_feature_rule(feature_name):
     """Delete a feature rule."""
     try:
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             flash(f'Feature rule "{feature_name}" not found.')
@@ -694,8 +864,7 @@ def delete_feature_rule(feature_name):
         rules_data['metadata']['total_rules'] = len(rules_data['rules'])
         
         # Save back to file
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         flash(f'Successfully deleted feature rule for "{feature_name}".')
         return redirect(url_for('feature_rules'))
@@ -714,19 +883,15 @@ def reorder_feature_rules():
             return jsonify({'error': 'No order provided'}), 400
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
-        # Create new ordered rules dictionary
-        new_rules = {}
-        for feature_name in new_order:
-            if feature_name in rules_data['rules']:
-                new_rules[feature_name] = rules_data['rules'][feature_name]
+        # Create new ordered rules dictionary; only references to the rules move
+        rules = rules_data['rules']
+        new_rules = {name: rules[name] for name in new_order if name in rules}
         
         # Add any missing rules that weren't in the order (shouldn't happen, but safety)
-        for feature_name, rule in rules_data['rules'].items():
-            if feature_name not in new_rules:
-                new_rules[feature_name] = rule
+        for feature_name, rule in rules.items():
+            new_rules.setdefault(feature_name, rule)
         
         # Update rules with new order
         rules_data['rules'] = new_rules
@@ -736,8 +901,7 @@ def reorder_feature_rules():
         rules_data['last_updated'] = datetime.now().strftime('%Y-%m-%d')
         
         # Save back to file
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         return jsonify({'success': True, 'message': 'Rules reordered successfully'})
         
@@ -748,21 +912,27 @@ def reorder_feature_rules():
 def manage_testcases(feature_name):
     """Manage test cases for a specific feature."""
     try:
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data()
         
         if feature_name not in rules_data.get('rules', {}):
             flash(f'Feature rule "{feature_name}" not found.')
             return redirect(url_for('feature_rules'))
         
+        etag = rules_etag('feature_rules.json')
+        cached = not_modified(etag) or cached_page(etag)
+        if cached is not None:
+            return cached
+        
         rule = rules_data['rules'][feature_name]
         testcases = rule.get('testcases', [])
         
-        return render_template('manage_testcases.html', 
-                             feature_name=feature_name,
-                             testcases=testcases,
-                             testcase_types=rules_data['metadata']['testcase_types'],
-                             environments=rules_data['metadata']['environments'])
+        has_flash = bool(session.get('_flashes'))
+        page = render_template('manage_testcases.html', 
+                               feature_name=feature_name,
+                               testcases=testcases,
+                               testcase_types=rules_data['metadata']['testcase_types'],
+                               environments=rules_data['metadata']['environments'])
+        return store_page(etag, page, has_flash)
     except Exception as e:
         flash(f'Error loading test cases: {str(e)}')
         return redirect(url_for('feature_rules'))
@@ -772,8 +942,7 @@ def add_testcase(feature_name):
     """Add a new test case to a feature."""
     if request.method == 'GET':
         try:
-            with open('feature_rules.json', 'r', encoding='utf-8') as f:
-                rules_data = json.load(f)
+            rules_data = load_rules_data()
             
             return render_template('add_testcase.html', 
                                  feature_name=feature_name,
@@ -794,8 +963,7 @@ def add_testcase(feature_name):
             return redirect(url_for('add_testcase', feature_name=feature_name))
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             flash(f'Feature rule "{feature_name}" not found.')
@@ -826,8 +994,7 @@ def add_testcase(feature_name):
         rules_data['last_updated'] = datetime.now().strftime('%Y-%m-%d')
         
         # Save back to file
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         flash(f'Successfully added test case "{testcase_id}".')
         return redirect(url_for('manage_testcases', feature_name=feature_name))
@@ -841,8 +1008,7 @@ def edit_testcase(feature_name, testcase_id):
     """Edit an existing test case."""
     if request.method == 'GET':
         try:
-            with open('feature_rules.json', 'r', encoding='utf-8') as f:
-                rules_data = json.load(f)
+            rules_data = load_rules_data()
             
             if feature_name not in rules_data.get('rules', {}):
                 flash(f'Feature rule "{feature_name}" not found.')
@@ -875,8 +1041,7 @@ def edit_testcase(feature_name, testcase_id):
             return redirect(url_for('edit_testcase', feature_name=feature_name, testcase_id=testcase_id))
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             flash(f'Feature rule "{feature_name}" not found.')
@@ -899,8 +1064,7 @@ def edit_testcase(feature_name, testcase_id):
         rules_data['last_updated'] = datetime.now().strftime('%Y-%m-%d')
         
         # Save back to file
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         flash(f'Successfully updated test case "{testcase_id}".')
         return redirect(url_for('manage_testcases', feature_name=feature_name))
@@ -914,8 +1078,7 @@ def delete_testcase(feature_name, testcase_id):
     """Delete a test case."""
     try:
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             flash(f'Feature rule "{feature_name}" not found.')
@@ -935,8 +1098,7 @@ def delete_testcase(feature_name, testcase_id):
         rules_data['last_updated'] = datetime.now().strftime('%Y-%m-%d')
         
         # Save back to file
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         flash(f'Successfully deleted test case "{testcase_id}".')
         return redirect(url_for('manage_testcases', feature_name=feature_name))
@@ -1015,8 +1177,7 @@ def api_add_payment_method(feature_name):
             return jsonify({'success': False, 'error': 'Payment method name is required'})
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             return jsonify({'success': False, 'error': 'Feature rule not found'})
@@ -1032,8 +1193,7 @@ def api_add_payment_method(feature_name):
             }
         
         # Save updated rules
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -1046,8 +1206,7 @@ def api_update_feature_rule(feature_name):
         data = request.get_json()
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             return jsonify({'success': False, 'error': 'Feature rule not found'})
@@ -1057,8 +1216,7 @@ def api_update_feature_rule(feature_name):
             rules_data['rules'][feature_name]['feature_name'] = data['feature_name']
         
         # Save updated rules
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -1083,8 +1241,7 @@ def api_create_testcase():
                 return jsonify({'success': False, 'error': 'Missing feature_name or payment_method, and invalid ID format'})
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             return jsonify({'success': False, 'error': 'Feature rule not found'})
@@ -1115,8 +1272,7 @@ def api_create_testcase():
         rules_data['rules'][feature_name]['by_payment_method'][payment_method]['testcases'].append(new_testcase)
         
         # Save updated rules
-        with open('feature_rules.json', 'w', encoding='utf-8') as f:
-            json.dump(rules_data, f, indent=2, ensure_ascii=False)
+        save_rules_data(rules_data)
         
         # Update i18n files with the description
         description_text = data.get('description', '')
@@ -1136,8 +1292,7 @@ def api_update_testcase(testcase_id):
         data = request.get_json()
         
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         # Find and update test case in regular rules
         for feature_name, rule in rules_data.get('rules', {}).items():
@@ -1154,8 +1309,7 @@ def api_update_testcase(testcase_id):
                                 testcase['environment'] = data['environment']
                             
                             # Save updated rules
-                            with open('feature_rules.json', 'w', encoding='utf-8') as f:
-                                json.dump(rules_data, f, indent=2, ensure_ascii=False)
+                            save_rules_data(rules_data)
                             
                             # Update i18n files if description is provided
                             if 'description' in data and data['description']:
@@ -1180,8 +1334,7 @@ def api_update_testcase(testcase_id):
                     testcase['environment'] = data['environment']
                 
                 # Save updated rules
-                with open('feature_rules.json', 'w', encoding='utf-8') as f:
-                    json.dump(rules_data, f, indent=2, ensure_ascii=False)
+                save_rules_data(rules_data)
                 
                 # Update i18n files if description is provided
                 if 'description' in data and data['description']:
@@ -1202,8 +1355,7 @@ def api_delete_testcase(testcase_id):
     """Delete a test case."""
     try:
         # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(for_update=True)
         
         # Find and delete test case in regular rules
         for feature_name, rule in rules_data.get('rules', {}).items():
@@ -1215,8 +1367,7 @@ def api_delete_testcase(testcase_id):
                             pm_config['testcases'].pop(i)
                             
                             # Save updated rules
-                            with open('feature_rules.json', 'w', encoding='utf-8') as f:
-                                json.dump(rules_data, f, indent=2, ensure_ascii=False)
+                            save_rules_data(rules_data)
                             
                             return jsonify({'success': True})
         
@@ -1228,8 +1379,7 @@ def api_delete_testcase(testcase_id):
                 master_rules['testcases'].pop(i)
                 
                 # Save updated rules
-                with open('feature_rules.json', 'w', encoding='utf-8') as f:
-                    json.dump(rules_data, f, indent=2, ensure_ascii=False)
+                save_rules_data(rules_data)
                 
                 return jsonify({'success': True})
         
@@ -1244,49 +1394,23 @@ def api_get_testcase_data(testcase_id):
         # Get locale from query parameter, default to 'en'
         locale = request.args.get('locale', 'en')
         
-        # Load current rules
-        with open('feature_rules.json', 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
-        
-        # Find test case in regular rules
-        for feature_name, rule in rules_data.get('rules', {}).items():
-            if 'by_payment_method' in rule:
-                for pm_name, pm_config in rule['by_payment_method'].items():
-                    for testcase in pm_config.get('testcases', []):
-                        if testcase['id'] == testcase_id:
-                            # Get description text from i18n using the specified locale
-                            description_key = testcase.get('description_key', '')
-                            description_text = get_i18n_description(description_key, locale) if description_key else ''
-                            
-                            return jsonify({
-                                'success': True,
-                                'testcase': {
-                                    'id': testcase['id'],
-                                    'description_key': description_key,
-                                    'description': description_text,
-                                    'type': testcase['type'],
-                                    'environment': testcase['environment']
-                                }
-                            })
-        
-        # Check master rules if not found in regular rules
-        master_rules = rules_data.get('master', {})
-        for testcase in master_rules.get('testcases', []):
-            if testcase['id'] == testcase_id:
-                # Get description text from i18n using the specified locale
-                description_key = testcase.get('description_key', '')
-                description_text = get_i18n_description(description_key, locale) if description_key else ''
-                
-                return jsonify({
-                    'success': True,
-                    'testcase': {
-                        'id': testcase['id'],
-                        'description_key': description_key,
-                        'description': description_text,
-                        'type': testcase['type'],
-                        'environment': testcase['environment']
-                    }
-                })
+        # Look up the test case in regular and master rules
+        testcase = load_testcase_index().get(testcase_id)
+        if testcase is not None:
+            # Get description text from i18n using the specified locale
+            description_key = testcase.get('description_key', '')
+            description_text = get_i18n_description(description_key, locale) if description_key else ''
+            
+            return jsonify({
+                'success': True,
+                'testcase': {
+                    'id': testcase['id'],
+                    'description_key': description_key,
+                    'description': description_text,
+                    'type': testcase['type'],
+                    'environment': testcase['environment']
+                }
+            })
         
         return jsonify({'success': False, 'error': 'Test case not found'})
     except Exception as e:
@@ -1300,8 +1424,7 @@ def api_get_feature_data(feature_name):
         rules_file = get_current_rules_file()
         
         # Load current rules
-        with open(rules_file, 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(rules_file)
         
         # Find feature in regular rules
         if feature_name in rules_data.get('rules', {}):
@@ -1360,8 +1483,7 @@ def api_provider_steps(feature_name, provider):
         rules_file = get_current_rules_file()
         
         # Load current rules
-        with open(rules_file, 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(rules_file, for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             return jsonify({'success': False, 'error': 'Feature rule not found'})
@@ -1420,8 +1542,7 @@ def api_provider_steps(feature_name, provider):
             feature_rule['by_provider'][provider_name] = steps
             
             # Save updated rules
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(rules_data, f, indent=2, ensure_ascii=False)
+            save_rules_data(rules_data, rules_file)
             
             return jsonify({'success': True, 'message': f'Added {len(steps)} step(s) for {provider_name}'})
         
@@ -1463,8 +1584,7 @@ def api_provider_steps(feature_name, provider):
             feature_rule['by_provider'][provider] = steps
             
             # Save updated rules
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(rules_data, f, indent=2, ensure_ascii=False)
+            save_rules_data(rules_data, rules_file)
             
             return jsonify({'success': True, 'message': f'Updated {len(steps)} step(s) for {provider}'})
         
@@ -1474,8 +1594,7 @@ def api_provider_steps(feature_name, provider):
                 del feature_rule['by_provider'][provider]
                 
                 # Save updated rules
-                with open(rules_file, 'w', encoding='utf-8') as f:
-                    json.dump(rules_data, f, indent=2, ensure_ascii=False)
+                save_rules_data(rules_data, rules_file)
                 
                 return jsonify({'success': True, 'message': f'Deleted steps for {provider}'})
             else:
@@ -1492,8 +1611,7 @@ def api_payment_method_steps(feature_name, payment_method):
         rules_file = get_current_rules_file()
         
         # Load current rules
-        with open(rules_file, 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(rules_file, for_update=True)
         
         if feature_name not in rules_data.get('rules', {}):
             return jsonify({'success': False, 'error': 'Feature rule not found'})
@@ -1560,8 +1678,7 @@ def api_payment_method_steps(feature_name, payment_method):
             feature_rule['by_payment_method'][payment_method]['integration_steps'] = steps
             
             # Save updated rules
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(rules_data, f, indent=2, ensure_ascii=False)
+            save_rules_data(rules_data, rules_file)
             
             return jsonify({'success': True, 'message': f'Updated {len(steps)} integration step(s) for {feature_name} - {payment_method}'})
         
@@ -1576,8 +1693,7 @@ def api_master_steps():
         rules_file = get_current_rules_file()
         
         # Load current rules
-        with open(rules_file, 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(rules_file, for_update=True)
         
         if 'master' not in rules_data:
             rules_data['master'] = {}
@@ -1630,8 +1746,7 @@ def api_master_steps():
             master_rules['integration_steps'] = steps
             
             # Save updated rules
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(rules_data, f, indent=2, ensure_ascii=False)
+            save_rules_data(rules_data, rules_file)
             
             return jsonify({'success': True, 'message': f'Updated {len(steps)} master step(s)'})
         
@@ -1654,16 +1769,12 @@ def api_feature_rules_files():
                 })
             
             # Get provider-specific files
-            provider_files = RulesManager.get_provider_rules_files()
-            for file_path in provider_files:
-                filename = os.path.basename(file_path)
-                if filename.startswith('feature_rules_') and filename.endswith('.json'):
-                    provider = filename[14:-5]
-                    available_rules_files.append({
-                        'filename': filename,
-                        'name': provider,
-                        'path': file_path
-                    })
+            for info in list_provider_rules_files():
+                available_rules_files.append({
+                    'filename': info['filename'],
+                    'name': info['provider'],
+                    'path': info['path']
+                })
             
             return jsonify({
                 'success': True,
@@ -1688,10 +1799,6 @@ def api_feature_rules_files():
             # Create filename
             new_filename = f'feature_rules_{file_name}.json'
             
-            # Check if file already exists
-            if os.path.exists(new_filename):
-                return jsonify({'success': False, 'error': f'File "{new_filename}" already exists'})
-            
             # Load default feature_rules.json as template
             template_data = {
                 'version': '1.0.0',
@@ -1730,9 +1837,14 @@ def api_feature_rules_files():
             template_data['metadata']['file_name'] = file_name
             template_data['metadata']['description'] = data.get('description', f'Feature rules for {file_name}')
             
-            # Save new file
-            with open(new_filename, 'w', encoding='utf-8') as f:
-                json.dump(template_data, f, indent=2, ensure_ascii=False)
+            # Save new file; exclusive creation never overwrites an existing file
+            try:
+                with open(new_filename, 'x', encoding='utf-8') as f:
+                    json.dump(template_data, f, indent=2, ensure_ascii=False)
+            except FileExistsError:
+                return jsonify({'success': False, 'error': f'File "{new_filename}" already exists'})
+            # The directory mtime may not have ticked since the last scan
+            _read_provider_rules_files.cache_clear()
             
             return jsonify({
                 'success': True,
@@ -1784,8 +1896,7 @@ def api_master_provider_steps(provider):
         rules_file = get_current_rules_file()
         
         # Load current rules
-        with open(rules_file, 'r', encoding='utf-8') as f:
-            rules_data = json.load(f)
+        rules_data = load_rules_data(rules_file, for_update=True)
         
         if 'master' not in rules_data:
             rules_data['master'] = {}
@@ -1844,8 +1955,7 @@ def api_master_provider_steps(provider):
             master_rules['by_provider'][provider_name] = steps
             
             # Save updated rules
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(rules_data, f, indent=2, ensure_ascii=False)
+            save_rules_data(rules_data, rules_file)
             
             return jsonify({'success': True, 'message': f'Added {len(steps)} master step(s) for {provider_name}'})
         
@@ -1887,8 +1997,7 @@ def api_master_provider_steps(provider):
             master_rules['by_provider'][provider] = steps
             
             # Save updated rules
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(rules_data, f, indent=2, ensure_ascii=False)
+            save_rules_data(rules_data, rules_file)
             
             return jsonify({'success': True, 'message': f'Updated {len(steps)} master step(s) for {provider}'})
         
@@ -1898,8 +2007,7 @@ def api_master_provider_steps(provider):
                 del master_rules['by_provider'][provider]
                 
                 # Save updated rules
-                with open(rules_file, 'w', encoding='utf-8') as f:
-                    json.dump(rules_data, f, indent=2, ensure_ascii=False)
+                save_rules_data(rules_data, rules_file)
                 
                 return jsonify({'success': True, 'message': f'Deleted master steps for {provider}'})
             else: